@@ -317,12 +317,18 @@ class GatewayClient:
         except Exception as error:
             self.logger.error(f"Failed to delete listener: \n {error}")
 
-    @cli.cmd()
+    @cli.cmd([
+        argument("-n",
+                 "--subnqn",
+                 help="Only show the subsystem with this NQN (optional, an"
+                 " unknown NQN shows an empty list)",
+                 default=""),
+    ])
     def get_subsystems(self, args):
         """Gets subsystems."""
 
         try:
-            req = pb2.get_subsystems_req()
+            req = pb2.get_subsystems_req(subsystem_nqn=args.subnqn)
             ret = self.stub.get_subsystems(req)
             subsystems = json.loads(ret.subsystems)
             formatted_subsystems = json.dumps(subsystems, indent=4)
@@ -25,6 +25,7 @@ class GatewayService(pb2_grpc.GatewayServicer):
         config: Basic gateway parameters
         logger: Logger instance to track server events
         gateway_name: Gateway identifier
+        gateway_addr: Default listener address for this gateway
         gateway_state: Methods for target state persistence
         spdk_rpc: Module methods for SPDK
         spdk_rpc_client: Client of SPDK RPC server
@@ -41,6 +42,7 @@ class GatewayService(pb2_grpc.GatewayServicer):
         self.gateway_name = self.config.get("gateway", "name")
         if not self.gateway_name:
             self.gateway_name = socket.gethostname()
+        self.gateway_addr = self.config.get_with_default("gateway", "addr", "")
 
     def create_bdev(self, request, context=None):
         """Creates a bdev from an RBD image."""
@@ -337,7 +339,7 @@ class GatewayService(pb2_grpc.GatewayServicer):
             if not request.gateway_name or \
                request.gateway_name == self.gateway_name:
                 if not request.traddr:
-                    traddr = self.config.get("gateway", "addr")
+                    traddr = self.gateway_addr
                     if not traddr:
                         raise Exception("gateway.addr option is not set")
                 else:
@@ -393,7 +395,7 @@ class GatewayService(pb2_grpc.GatewayServicer):
             if not request.gateway_name or \
                request.gateway_name == self.gateway_name:
                 if not request.traddr:
-                    traddr = self.config.get("gateway", "addr")
+                    traddr = self.gateway_addr
                     if not traddr:
                         raise Exception("gateway.addr option is not set")
                 else:
@@ -436,6 +438,9 @@ class GatewayService(pb2_grpc.GatewayServicer):
         self.logger.info(f"Received request to get subsystems")
         try:
             ret = self.spdk_rpc.nvmf.nvmf_get_subsystems(self.spdk_rpc_client)
+            if request.subsystem_nqn:
+                ret = [subsystem for subsystem in ret
+                       if subsystem["nqn"] == request.subsystem_nqn]
             self.logger.info(f"get_subsystems: {ret}")
         except Exception as ex:
             self.logger.error(f"get_subsystems failed with: \n {ex}")
@@ -443,4 +448,5 @@ class GatewayService(pb2_grpc.GatewayServicer):
             context.set_details(f"{ex}")
             return pb2.subsystems_info()
 
-        return pb2.subsystems_info(subsystems=json.dumps(ret))
+        return pb2.subsystems_info(
+            subsystems=json.dumps(ret, separators=(",", ":")))
@@ -9,7 +9,7 @@
 
 import rados
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Tuple
 from abc import ABC, abstractmethod
 from .generated import gateway_pb2 as pb2
 from google.protobuf import json_format
@@ -146,6 +146,10 @@ class OmapGatewayState(GatewayState):
 
     def _remove_key(self, key: str):
         """Removes key from the OMAP."""
+        self._remove_keys([key])
+
+    def _remove_keys(self, keys: List[str]):
+        """Removes keys from the OMAP in a single write operation."""
 
         try:
             version_update = self.version + 1
@@ -153,14 +157,14 @@ class OmapGatewayState(GatewayState):
                 # Compare operation failure will cause remove failure
                 write_op.omap_cmp(self.OMAP_VERSION_KEY, str(self.version),
                                   rados.LIBRADOS_CMPXATTR_OP_EQ)
-                self.ioctx.remove_omap_keys(write_op, (key,))
+                self.ioctx.remove_omap_keys(write_op, tuple(keys))
                 self.ioctx.set_omap(write_op, (self.OMAP_VERSION_KEY,),
                                     (str(version_update),))
                 self.ioctx.operate_write_op(write_op, self.omap_name)
             self.version = version_update
-            self.logger.debug(f"omap_key removed: {key}")
+            self.logger.debug(f"omap_keys removed: {keys}")
         except Exception as ex:
-            self.logger.error(f"Unable to remove key from omap: {ex}. Exiting!")
+            self.logger.error(f"Unable to remove keys from omap: {ex}. Exiting!")
             raise
 
     def add_bdev(self, bdev_name: str, val: str):
@@ -173,13 +177,12 @@ class OmapGatewayState(GatewayState):
         key = self.BDEV_PREFIX + bdev_name
         self._remove_key(key)
 
-    def _restore_bdevs(self, omap_dict, callback):
+    def _restore_bdevs(self, entries, callback):
         """Restores a bdev from the OMAP."""
 
-        for (key, val) in omap_dict.items():
-            if key.startswith(self.BDEV_PREFIX):
-                req = json_format.Parse(val, pb2.create_bdev_req())
-                callback(req)
+        for (key, val) in entries:
+            req = json_format.Parse(val, pb2.create_bdev_req())
+            callback(req)
 
     def add_namespace(self, subsystem_nqn: str, nsid: str, val: str):
         """Adds a namespace to the OMAP."""
@@ -191,16 +194,15 @@ class OmapGatewayState(GatewayState):
         key = self.NAMESPACE_PREFIX + subsystem_nqn + "_" + nsid
         self._remove_key(key)
 
-    def _restore_namespaces(self, omap_dict, callback):
+    def _restore_namespaces(self, entries, callback):
         """Restores a namespace from the OMAP."""
 
-        for (key, val) in omap_dict.items():
-            if key.startswith(self.NAMESPACE_PREFIX):
-                # Get NSID from end of key
-                nsid = key.rsplit("_", 1)[1]
-                req = json_format.Parse(val, pb2.add_namespace_req())
-                req.nsid = int(nsid)
-                callback(req)
+        for (key, val) in entries:
+            # Get NSID from end of key
+            nsid = key.rsplit("_", 1)[1]
+            req = json_format.Parse(val, pb2.add_namespace_req())
+            req.nsid = int(nsid)
+            callback(req)
 
     def add_subsystem(self, subsystem_nqn: str, val: str):
         """Adds a subsystem to the OMAP."""
@@ -209,24 +211,36 @@ class OmapGatewayState(GatewayState):
 
     def remove_subsystem(self, subsystem_nqn: str):
         """Removes a subsystem from the OMAP."""
-        key = self.SUBSYSTEM_PREFIX + subsystem_nqn
-        self._remove_key(key)
-
-        # Delete all keys related to subsystem
-        omap_dict = self._read_all()
-        for key in omap_dict.keys():
-            if (key.startswith(self.NAMESPACE_PREFIX + subsystem_nqn) or
-                    key.startswith(self.HOST_PREFIX + subsystem_nqn) or
-                    key.startswith(self.LISTENER_PREFIX + subsystem_nqn)):
-                self._remove_key(key)
-
-    def _restore_subsystems(self, omap_dict, callback):
+        keys = [self.SUBSYSTEM_PREFIX + subsystem_nqn]
+
+        # Delete all keys related to subsystem in the same write operation.
+        # Match on the NQN stored in each value rather than on the key:
+        # listener keys start with the gateway name, and one NQN may be a
+        # prefix of another (e.g. cnode1 and cnode10).
+        index = self._index_by_prefix(self._read_all())
+        related = (
+            (self.NAMESPACE_PREFIX, pb2.add_namespace_req, "subsystem_nqn"),
+            (self.HOST_PREFIX, pb2.add_host_req, "subsystem_nqn"),
+            (self.LISTENER_PREFIX, pb2.create_listener_req, "nqn"),
+        )
+        for (prefix, req_type, nqn_field) in related:
+            for (key, val) in index[prefix]:
+                try:
+                    req = json_format.Parse(val, req_type(),
+                                            ignore_unknown_fields=True)
+                except json_format.ParseError as ex:
+                    self.logger.warning(f"Skipping unparsable key {key}: {ex}")
+                    continue
+                if getattr(req, nqn_field) == subsystem_nqn:
+                    keys.append(key)
+        self._remove_keys(keys)
+
+    def _restore_subsystems(self, entries, callback):
         """Restores subsystems from the OMAP."""
 
-        for (key, val) in omap_dict.items():
-            if key.startswith(self.SUBSYSTEM_PREFIX):
-                req = json_format.Parse(val, pb2.create_subsystem_req())
-                callback(req)
+        for (key, val) in entries:
+            req = json_format.Parse(val, pb2.create_subsystem_req())
+            callback(req)
 
     def add_host(self, subsystem_nqn: str, host_nqn: str, val: str):
         """Adds a host to the OMAP."""
@@ -238,13 +252,12 @@ class OmapGatewayState(GatewayState):
         key = "{}{}_{}".format(self.HOST_PREFIX, subsystem_nqn, host_nqn)
         self._remove_key(key)
 
-    def _restore_hosts(self, omap_dict, callback):
+    def _restore_hosts(self, entries, callback):
         """Restore hosts from the OMAP."""
 
-        for (key, val) in omap_dict.items():
-            if key.startswith(self.HOST_PREFIX):
-                req = json_format.Parse(val, pb2.add_host_req())
-                callback(req)
+        for (key, val) in entries:
+            req = json_format.Parse(val, pb2.add_host_req())
+            callback(req)
 
     def add_listener(self, subsystem_nqn: str, gateway: str, trtype: str,
                      traddr: str, trsvcid: str, val: str):
@@ -260,26 +273,12 @@ class OmapGatewayState(GatewayState):
                                         subsystem_nqn, trtype, traddr, trsvcid)
         self._remove_key(key)
 
-    def _restore_listeners(self, omap_dict, callback):
+    def _restore_listeners(self, entries, callback):
         """Restores listeners from the OMAP."""
 
-        for (key, val) in omap_dict.items():
-            if key.startswith(self.LISTENER_PREFIX):
-                req = json_format.Parse(val, pb2.create_listener_req())
-                callback(req)
-
-    def _read_key(self, key) -> Optional[str]:
-        """Reads a key from the OMAP and returns its value."""
-
-        with rados.ReadOpCtx() as read_op:
-            iter, _ = self.ioctx.get_omap_vals_by_keys(read_op, (key,))
-            self.ioctx.operate_read_op(read_op, self.omap_name)
-            value_list = list(dict(iter).values())
-            if len(value_list) == 1:
-                val = str(value_list[0], "utf-8")
-                self.logger.debug(f"Read key: {key} -> {val}")
-                return val
-        return None
+        for (key, val) in entries:
+            req = json_format.Parse(val, pb2.create_listener_req())
+            callback(req)
 
     def _read_all(self) -> Dict[str, str]:
         """Reads OMAP and returns dict of all keys and values."""
@@ -290,6 +289,24 @@ class OmapGatewayState(GatewayState):
             omap_dict = dict(iter)
         return omap_dict
 
+    def _index_by_prefix(
+            self, omap_dict: Dict[str, str]) -> Dict[str, List[Tuple[str, str]]]:
+        """Groups OMAP keys and values by key type in a single pass."""
+
+        index = {
+            self.BDEV_PREFIX: [],
+            self.SUBSYSTEM_PREFIX: [],
+            self.NAMESPACE_PREFIX: [],
+            self.HOST_PREFIX: [],
+            self.LISTENER_PREFIX: [],
+        }
+        for (key, val) in omap_dict.items():
+            # Key type is everything up to and including the first "_"
+            entries = index.get(key.split("_", 1)[0] + "_")
+            if entries is not None:
+                entries.append((key, val))
+        return index
+
     def delete_state(self):
         """Deletes OMAP object."""
 
@@ -302,17 +319,21 @@ class OmapGatewayState(GatewayState):
     def restore(self, callbacks):
         """Restores gateway state to OMAP specifications."""
 
-        omap_version = self._read_key(self.OMAP_VERSION_KEY)
-        if omap_version == "1":
+        omap_dict = self._read_all()
+        omap_version = int(omap_dict[self.OMAP_VERSION_KEY])
+        if omap_version == 1:
             self.logger.info("This omap was just created. Nothing to restore")
         else:
-            omap_dict = self._read_all()
-            self._restore_bdevs(omap_dict, callbacks[self.BDEV_PREFIX])
-            self._restore_subsystems(omap_dict,
+            index = self._index_by_prefix(omap_dict)
+            self._restore_bdevs(index[self.BDEV_PREFIX],
+                                callbacks[self.BDEV_PREFIX])
+            self._restore_subsystems(index[self.SUBSYSTEM_PREFIX],
                                      callbacks[self.SUBSYSTEM_PREFIX])
-            self._restore_namespaces(omap_dict,
+            self._restore_namespaces(index[self.NAMESPACE_PREFIX],
                                      callbacks[self.NAMESPACE_PREFIX])
-            self._restore_hosts(omap_dict, callbacks[self.HOST_PREFIX])
-            self._restore_listeners(omap_dict, callbacks[self.LISTENER_PREFIX])
-            self.version = int(omap_dict[self.OMAP_VERSION_KEY])
+            self._restore_hosts(index[self.HOST_PREFIX],
+                                callbacks[self.HOST_PREFIX])
+            self._restore_listeners(index[self.LISTENER_PREFIX],
+                                    callbacks[self.LISTENER_PREFIX])
+            self.version = omap_version
             self.logger.info("Restore complete.")
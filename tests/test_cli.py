@@ -1,4 +1,6 @@
 import pytest
+import json
+import logging
 import socket
 from control.cli import main as cli
 
@@ -16,6 +18,16 @@ listener_list = [["-g", gateway_name, "-a", addr, "-s", "5001"], ["-s", "5002"]]
 config = "ceph-nvmeof.conf"
 
 
+def get_subsystems_output(caplog):
+    """Returns the subsystem list logged by the get_subsystems command."""
+
+    for record in caplog.records:
+        message = record.getMessage()
+        if message.startswith("Get subsystems:"):
+            return json.loads(message.split("\n", 1)[1])
+    return None
+
+
 class TestGet:
     def test_get_subsystems(self, caplog):
         cli(["-c", config, "get_subsystems"])
@@ -31,6 +43,20 @@ class TestCreate:
         cli(["-c", config, "create_subsystem", "-n", subsystem, "-s", serial])
         assert "Failed to create" not in caplog.text
 
+    def test_get_subsystem(self, caplog):
+        caplog.set_level(logging.INFO)
+        cli(["-c", config, "get_subsystems", "-n", subsystem])
+        assert "Failed to get" not in caplog.text
+        subsystems = get_subsystems_output(caplog)
+        assert len(subsystems) == 1
+        assert subsystems[0]["nqn"] == subsystem
+
+    def test_get_subsystem_not_found(self, caplog):
+        caplog.set_level(logging.INFO)
+        cli(["-c", config, "get_subsystems", "-n", subsystem + "-missing"])
+        assert "Failed to get" not in caplog.text
+        assert get_subsystems_output(caplog) == []
+
     def test_add_namespace(self, caplog):
         cli(["-c", config, "add_namespace", "-n", subsystem, "-b", bdev])
         assert "Failed to add" not in caplog.text
@@ -0,0 +1,80 @@
+import pytest
+from google.protobuf import json_format
+from control.config import GatewayConfig
+from control.state import OmapGatewayState
+from control.generated import gateway_pb2 as pb2
+
+config = "ceph-nvmeof.conf"
+group = "test_state"
+bdev = "Ceph0"
+gateway_name = "gw"
+trtype = "TCP"
+addr = "127.0.0.1"
+trsvcid = "5001"
+# cnode1 is a prefix of cnode10
+subsystem = "nqn.2016-06.io.spdk:cnode1"
+other_subsystem = "nqn.2016-06.io.spdk:cnode10"
+
+
+def to_json(req):
+    return json_format.MessageToJson(req, preserving_proto_field_name=True)
+
+
+@pytest.fixture
+def state():
+    """Returns gateway state backed by a fresh OMAP object."""
+
+    gateway_config = GatewayConfig(config)
+    gateway_config.config.set("gateway", "group", group)
+    OmapGatewayState(gateway_config).delete_state()
+    state = OmapGatewayState(gateway_config)
+    yield state
+    state.delete_state()
+
+
+def add_subsystem_keys(state, nqn):
+    """Adds a subsystem with a namespace, host and listener to the OMAP.
+
+    Returns the OMAP keys that were added.
+    """
+
+    state.add_subsystem(
+        nqn,
+        to_json(pb2.create_subsystem_req(subsystem_nqn=nqn, serial_number="1")))
+    state.add_namespace(
+        nqn, "1",
+        to_json(pb2.add_namespace_req(subsystem_nqn=nqn, bdev_name=bdev)))
+    state.add_host(nqn, "*",
+                   to_json(pb2.add_host_req(subsystem_nqn=nqn, host_nqn="*")))
+    state.add_listener(
+        nqn, gateway_name, trtype, addr, trsvcid,
+        to_json(
+            pb2.create_listener_req(nqn=nqn,
+                                    gateway_name=gateway_name,
+                                    trtype=trtype,
+                                    traddr=addr,
+                                    trsvcid=trsvcid)))
+    return {
+        state.SUBSYSTEM_PREFIX + nqn,
+        state.NAMESPACE_PREFIX + nqn + "_1",
+        state.HOST_PREFIX + nqn + "_*",
+        "{}{}_{}_{}_{}_{}".format(state.LISTENER_PREFIX, gateway_name, nqn,
+                                  trtype, addr, trsvcid),
+    }
+
+
+class TestRemoveSubsystem:
+    def test_remove_subsystem(self, state):
+        add_subsystem_keys(state, subsystem)
+        other_keys = add_subsystem_keys(state, other_subsystem)
+        state.remove_subsystem(subsystem)
+        keys = set(state._read_all().keys())
+        assert keys == other_keys | {state.OMAP_VERSION_KEY}
+
+    def test_remove_subsystem_unparsable_key(self, state):
+        add_subsystem_keys(state, subsystem)
+        bad_key = state.NAMESPACE_PREFIX + other_subsystem + "_1"
+        state.add_namespace(other_subsystem, "1", "not json")
+        state.remove_subsystem(subsystem)
+        keys = set(state._read_all().keys())
+        assert keys == {bad_key, state.OMAP_VERSION_KEY}